@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Share the pipeline modules (validation rules, custom transformers) with the API
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
@@ -0,0 +1,178 @@
+import os
+import time
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+logger = logging.getLogger("property-api.admission")
+
+RATE_LIMIT_RPS = float(os.getenv("RATE_LIMIT_RPS", "10"))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "20"))
+MAX_IN_FLIGHT = int(os.getenv("MAX_IN_FLIGHT", "16"))
+SHED_LATENCY_MS = float(os.getenv("SHED_LATENCY_MS", "1000"))
+MAX_STREAMS = int(os.getenv("MAX_STREAMS", "4"))
+MAX_IN_FLIGHT_PER_KEY = int(os.getenv("MAX_IN_FLIGHT_PER_KEY", "4"))
+MAX_STREAMS_PER_KEY = int(os.getenv("MAX_STREAMS_PER_KEY", "1"))
+MAX_BATCHES_IN_FLIGHT = int(os.getenv("MAX_BATCHES_IN_FLIGHT", "4"))
+SHED_BATCH_LATENCY_MS = float(os.getenv("SHED_BATCH_LATENCY_MS", "10000"))
+ROW_RATE_LIMIT = float(os.getenv("ROW_RATE_LIMIT", "1000"))
+ROW_RATE_BURST = float(os.getenv("ROW_RATE_BURST", "10000"))
+
+
+class AdmissionMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.shed: Dict[str, int] = defaultdict(int)
+        self.rate_limited: Dict[str, int] = defaultdict(int)
+
+    def record_admitted(self) -> None:
+        with self._lock:
+            self.admitted += 1
+
+    def record_shed(self, reason: str) -> None:
+        with self._lock:
+            self.shed[reason] += 1
+
+    def record_rate_limited(self, client: str) -> None:
+        with self._lock:
+            self.rate_limited[client] += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "admitted": self.admitted,
+                "shed": dict(self.shed),
+                "rate_limited": dict(self.rate_limited),
+            }
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets refilled lazily on access, so each check is O(1).
+
+    A cost above ``burst`` is admitted from a full bucket and leaves it in
+    debt, so large batches still pay for every row.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def acquire(self, key: str, cost: float = 1.0) -> float:
+        """Take ``cost`` tokens for ``key``; return 0 when allowed, else seconds to wait."""
+        if self.rate <= 0:
+            return 0.0
+
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            required = min(cost, self.burst)
+            if tokens >= required:
+                self._buckets[key] = (tokens - cost, now)
+                return 0.0
+            self._buckets[key] = (tokens, now)
+            return (required - tokens) / self.rate
+
+
+class LoadShedder:
+    """Admission gate on in-flight requests and smoothed latency.
+
+    Slots are capped globally and per API key, so one client cannot hold all
+    of them. When the latency average is over threshold, requests are still
+    admitted while nothing is in flight so the average can recover.
+    """
+
+    def __init__(self, name: str, max_in_flight: int, latency_threshold_s: float,
+                 max_per_key: int = 0, alpha: float = 0.2):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.latency_threshold_s = latency_threshold_s
+        self.max_per_key = max_per_key
+        self.alpha = alpha
+        self.in_flight = 0
+        self.latency_ewma_s = 0.0
+        self._per_key: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, key: str) -> Optional[str]:
+        with self._lock:
+            if self.max_per_key > 0 and self._per_key.get(key, 0) >= self.max_per_key:
+                return "key_limit"
+            if self.max_in_flight > 0 and self.in_flight >= self.max_in_flight:
+                return "queue_full"
+            if (self.latency_threshold_s > 0 and self.in_flight > 0
+                    and self.latency_ewma_s > self.latency_threshold_s):
+                return "latency"
+            self.in_flight += 1
+            self._per_key[key] = self._per_key.get(key, 0) + 1
+            return None
+
+    def release(self, key: str, latency_s: Optional[float]) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self._per_key[key] -= 1
+            if not self._per_key[key]:
+                del self._per_key[key]
+            if latency_s is not None:
+                self.latency_ewma_s += self.alpha * (latency_s - self.latency_ewma_s)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+                "latency_ewma_ms": self.latency_ewma_s * 1000.0,
+                "latency_threshold_ms": self.latency_threshold_s * 1000.0,
+            }
+
+
+def acquire_or_shed(shedder: LoadShedder, key: str) -> None:
+    reason = shedder.try_acquire(key)
+    if reason is not None:
+        metrics.record_shed(f"{shedder.name}_{reason}")
+        logger.warning("Request shed: %s_%s", shedder.name, reason)
+        if reason == "key_limit":
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many concurrent requests for this API key",
+                headers={"Retry-After": "1"}
+            )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service overloaded, retry later",
+            headers={"Retry-After": "1"}
+        )
+    metrics.record_admitted()
+
+
+@contextmanager
+def admission_slot(shedder: LoadShedder, key: str) -> Iterator[None]:
+    """Hold a shedder slot while inference runs, feeding its latency to the average.
+
+    Callers enter it only after authentication and rate limiting, so rejected
+    or slow unauthenticated requests never occupy capacity.
+    """
+    acquire_or_shed(shedder, key)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        shedder.release(key, time.perf_counter() - start)
+
+
+metrics = AdmissionMetrics()
+rate_limiter = TokenBucketLimiter(RATE_LIMIT_RPS, RATE_LIMIT_BURST)
+# Batches and streams are charged one token per row on top of the request token
+row_limiter = TokenBucketLimiter(ROW_RATE_LIMIT, ROW_RATE_BURST)
+load_shedder = LoadShedder("predict", MAX_IN_FLIGHT, SHED_LATENCY_MS / 1000.0, MAX_IN_FLIGHT_PER_KEY)
+# Large batches would inflate the single-row latency average, so they are gated separately
+batch_shedder = LoadShedder("batch", MAX_BATCHES_IN_FLIGHT, SHED_BATCH_LATENCY_MS / 1000.0, MAX_IN_FLIGHT_PER_KEY)
+# NDJSON uploads are long-lived, so they get their own slots and no latency check
+stream_limiter = LoadShedder("stream", MAX_STREAMS, 0.0, MAX_STREAMS_PER_KEY)
@@ -1,10 +1,14 @@
 import os
+import math
+import asyncio
 import secrets
 import logging
-from typing import Optional
-from fastapi import HTTPException, Security, status
+from typing import Dict, Optional
+from fastapi import Depends, HTTPException, Security, status
 from fastapi.security import APIKeyHeader
 
+from .admission import metrics, rate_limiter, row_limiter
+
 logger = logging.getLogger("property-api.auth")
 
 api_key_header = APIKeyHeader(
@@ -13,6 +17,34 @@ api_key_header = APIKeyHeader(
     auto_error=False
 )
 
+
+def load_api_keys() -> Dict[str, str]:
+    """Map each configured API key to a client name.
+
+    ``API_KEYS`` holds comma-separated ``client:key`` pairs (or bare keys);
+    the legacy single ``API_KEY`` variable is still honoured.
+    """
+    keys: Dict[str, str] = {}
+    for i, entry in enumerate(os.getenv("API_KEYS", "").split(",")):
+        entry = entry.strip()
+        if not entry:
+            continue
+        client, sep, key = entry.partition(":")
+        if sep:
+            keys[key.strip()] = client.strip()
+        else:
+            keys[entry] = f"client-{i}"
+    
+    legacy_key = os.getenv("API_KEY")
+    if legacy_key:
+        keys.setdefault(legacy_key, "default")
+    return keys
+
+
+def get_client_name(api_key: str) -> str:
+    return load_api_keys().get(api_key, "unknown")
+
+
 def get_api_key(api_key: Optional[str] = Security(api_key_header)) -> str:
     if not api_key:
         logger.warning("Authentication failed: API key missing")
@@ -22,15 +54,17 @@ def get_api_key(api_key: Optional[str] = Security(api_key_header)) -> str:
             headers={"WWW-Authenticate": "ApiKey"}
         )
     
-    valid_api_key = os.getenv("API_KEY")
-    if not valid_api_key:
-        logger.error("Authentication service error: API_KEY environment variable not set")
+    valid_api_keys = load_api_keys()
+    if not valid_api_keys:
+        logger.error("Authentication service error: API_KEY or API_KEYS environment variable not set")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Authentication service temporarily unavailable"
         )
     
-    if not secrets.compare_digest(api_key, valid_api_key):
+    # Compare against every key so timing does not reveal which one matched
+    matches = [secrets.compare_digest(api_key, valid_key) for valid_key in valid_api_keys]
+    if not any(matches):
         logger.warning("Authentication failed: Invalid API key provided")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -39,3 +73,37 @@ def get_api_key(api_key: Optional[str] = Security(api_key_header)) -> str:
         )
     
     return api_key
+
+
+def _raise_rate_limited(api_key: str, retry_after: float) -> None:
+    client = get_client_name(api_key)
+    metrics.record_rate_limited(client)
+    logger.warning("Rate limit exceeded for client: %s", client)
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Rate limit exceeded",
+        headers={"Retry-After": str(math.ceil(retry_after))}
+    )
+
+
+def get_rate_limited_api_key(api_key: str = Depends(get_api_key)) -> str:
+    retry_after = rate_limiter.acquire(api_key)
+    if retry_after > 0:
+        _raise_rate_limited(api_key, retry_after)
+    
+    return api_key
+
+
+def charge_rows(api_key: str, n_rows: int) -> None:
+    retry_after = row_limiter.acquire(api_key, n_rows)
+    if retry_after > 0:
+        _raise_rate_limited(api_key, retry_after)
+
+
+async def throttle_rows(api_key: str, n_rows: int) -> None:
+    """Wait until ``n_rows`` fit the key's row budget; streams slow down instead of failing mid-upload."""
+    retry_after = row_limiter.acquire(api_key, n_rows)
+    while retry_after > 0:
+        metrics.record_rate_limited(get_client_name(api_key))
+        await asyncio.sleep(retry_after)
+        retry_after = row_limiter.acquire(api_key, n_rows)
@@ -1,25 +1,38 @@
+import os
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import joblib
+import numpy as np
 import pandas as pd
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Request, status
+from starlette.concurrency import run_in_threadpool
 
-from .auth import get_api_key
-from .schemas import PropertyFeatures, PredictionResponse, HealthResponse
+from .admission import (acquire_or_shed, admission_slot, batch_shedder, load_shedder, metrics,
+                        stream_limiter)
+from .auth import charge_rows, get_api_key, get_rate_limited_api_key, throttle_rows
+from .ndjson import LineTooLongError, NDJSONStreamingResponse, dumps_line, iter_record_chunks
+from .schemas import (PropertyFeatures, PredictionResponse, HealthResponse,
+                      BatchPredictionRequest, BatchPredictionItem, BatchPredictionResponse,
+                      AdmissionMetricsResponse)
+from process.validation import validate_frame
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("property-api")
 
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "1000"))
+
 
 class ModelManager:
     def __init__(self):
         self.model: Optional[object] = None
         self.feature_columns: Optional[list] = None
         self.is_loaded: bool = False
-        self._model_path = Path(__file__).parent.parent / "models" / "property_model.joblib"
+        self._model_path = Path(os.getenv(
+            "MODEL_PATH", Path(__file__).parent.parent / "models" / "property_model.joblib"
+        ))
     
     def load_model(self) -> bool:
         try:
@@ -108,8 +121,61 @@ class ModelManager:
                 detail="Prediction failed"
             )
 
+    def predict_batch(self, features_df: pd.DataFrame) -> np.ndarray:
+        if not self.is_loaded or self.model is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE, 
+                detail="Model not available"
+            )
+        
+        if features_df.empty:
+            return np.empty(0, dtype=np.float64)
+        
+        try:
+            predictions = self.model.predict(features_df[self.feature_columns])
+            return np.asarray(predictions, dtype=np.float64)
+            
+        except KeyError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Missing required columns: {str(e)}"
+            )
+        except ValueError as e:
+            logger.error("Batch input validation error: %s", str(e))
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid input data format"
+            )
+        except Exception as e:
+            logger.error("Batch prediction error: %s", str(e))
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Prediction failed"
+            )
+
+
 model_manager = ModelManager()
 
+
+def score_records(records: List[Dict[str, Any]]) -> Tuple[List[Optional[float]], List[List[str]]]:
+    df = pd.DataFrame.from_records(records)
+    validation = validate_frame(df)
+    valid_mask = validation.valid_mask
+    
+    predictions = np.full(len(df), np.nan)
+    predictions[valid_mask] = model_manager.predict_batch(df[valid_mask])
+    
+    errors = validation.error_codes()
+    prices: List[Optional[float]] = []
+    for i, price in enumerate(predictions.tolist()):
+        # Non-positive or NaN predictions are rejected like in the single-row endpoint
+        if valid_mask[i] and not price > 0:
+            errors[i] = ["invalid_prediction"]
+        prices.append(price if price > 0 else None)
+    
+    return prices, errors
+
+
 app = FastAPI(
     title="Property Friends - Price Prediction API",
     description="API for predicting property prices using machine learning",
@@ -143,7 +209,7 @@ async def health_check():
           description="Predict Chilean property prices using machine learning. Requires property details like type, location, area, and coordinates.")
 async def predict_property_price(
     features: PropertyFeatures,
-    api_key: str = Depends(get_api_key)
+    api_key: str = Depends(get_rate_limited_api_key)
 ):
     try:
         logger.info("Prediction request received for property type: %s, sector: %s", 
@@ -153,7 +219,9 @@ async def predict_property_price(
         # No need for manual validation here
         
         df = pd.DataFrame([features.dict()])
-        predicted_price = model_manager.predict(df)
+        # Inference runs off the event loop so queued requests stay visible to admission control
+        with admission_slot(load_shedder, api_key):
+            predicted_price = await run_in_threadpool(model_manager.predict, df)
         
         if predicted_price <= 0:
             logger.warning("Unusual prediction result: %f", predicted_price)
@@ -181,6 +249,121 @@ async def predict_property_price(
         )
 
 
+@app.post("/predict/batch",
+          response_model=BatchPredictionResponse,
+          summary="Predict Property Prices in Bulk",
+          description="Score many properties in one request. Rows failing validation are returned with error codes instead of failing the whole batch.")
+async def predict_property_prices_batch(
+    request: BatchPredictionRequest,
+    api_key: str = Depends(get_rate_limited_api_key)
+):
+    try:
+        logger.info("Batch prediction request received for %d properties", len(request.properties))
+        
+        charge_rows(api_key, len(request.properties))
+        with admission_slot(batch_shedder, api_key):
+            prices, errors = await run_in_threadpool(score_records, request.properties)
+        items = [
+            BatchPredictionItem(index=i, predicted_price=price, errors=errors[i])
+            for i, price in enumerate(prices)
+        ]
+        
+        n_valid = sum(price is not None for price in prices)
+        n_invalid = len(prices) - n_valid
+        logger.info("Batch prediction completed - Valid: %d, Invalid: %d", n_valid, n_invalid)
+        
+        return BatchPredictionResponse(
+            predictions=items,
+            n_valid=n_valid,
+            n_invalid=n_invalid,
+            model_version="v1.0"
+        )
+        
+    except HTTPException as e:
+        logger.warning("HTTP exception in batch prediction: %s", e.detail)
+        raise
+    except Exception as e:
+        logger.error("Unexpected batch prediction error: %s", str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
+            detail="Internal server error"
+        )
+
+
+async def _stream_predictions(request: Request, api_key: str):
+    n_valid = n_total = 0
+    # Input line number reported if scoring a chunk fails
+    next_index = 0
+    try:
+        async for chunk in iter_record_chunks(request.stream(), STREAM_CHUNK_SIZE):
+            next_index = chunk[0][0]
+            await throttle_rows(api_key, len(chunk))
+            records = [record for _, record in chunk if record is not None]
+            prices, errors = await run_in_threadpool(score_records, records) if records else ([], [])
+            
+            scored = iter(zip(prices, errors))
+            lines = []
+            for index, record in chunk:
+                if record is None:
+                    price, row_errors = None, ["invalid_json"]
+                else:
+                    price, row_errors = next(scored)
+                lines.append(dumps_line({"index": index, "predicted_price": price, "errors": row_errors}))
+                n_valid += price is not None
+            n_total += len(chunk)
+            next_index = chunk[-1][0] + 1
+            yield b"".join(lines)
+        
+    except LineTooLongError as e:
+        logger.warning("Streaming prediction aborted: %s", str(e))
+        yield dumps_line({"index": e.line_number, "predicted_price": None, "errors": ["line_too_long"]})
+    except HTTPException as e:
+        logger.warning("HTTP exception in streaming prediction: %s", e.detail)
+        yield dumps_line({"index": next_index, "predicted_price": None, "errors": ["prediction_failed"]})
+    except Exception as e:
+        logger.error("Unexpected streaming prediction error: %s", str(e))
+        yield dumps_line({"index": next_index, "predicted_price": None, "errors": ["internal_error"]})
+    finally:
+        stream_limiter.release(api_key, None)
+    
+    logger.info("Streaming prediction completed - Valid: %d, Total: %d", n_valid, n_total)
+
+
+@app.post("/predict/stream",
+          summary="Stream Property Price Predictions",
+          description="Upload newline-delimited PropertyFeatures records (application/x-ndjson) and receive one NDJSON result per line as each chunk is scored.",
+          response_class=NDJSONStreamingResponse)
+async def predict_property_prices_stream(
+    request: Request,
+    api_key: str = Depends(get_rate_limited_api_key)
+):
+    if not model_manager.is_loaded:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, 
+            detail="Model not available"
+        )
+    
+    # The slot is released by the generator once the stream ends
+    acquire_or_shed(stream_limiter, api_key)
+    logger.info("Streaming prediction request received")
+    return NDJSONStreamingResponse(_stream_predictions(request, api_key))
+
+
+@app.get("/metrics", response_model=AdmissionMetricsResponse)
+async def admission_metrics(api_key: str = Depends(get_api_key)):
+    batches = batch_shedder.snapshot()
+    streams = stream_limiter.snapshot()
+    return AdmissionMetricsResponse(
+        **metrics.snapshot(),
+        **load_shedder.snapshot(),
+        batches_in_flight=batches["in_flight"],
+        max_batches=batches["max_in_flight"],
+        batch_latency_ewma_ms=batches["latency_ewma_ms"],
+        streams_in_flight=streams["in_flight"],
+        max_streams=streams["max_in_flight"]
+    )
+
+
 @app.get("/", include_in_schema=False)
 async def root():
     return {
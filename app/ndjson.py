@@ -0,0 +1,103 @@
+import json
+import logging
+from typing import Any, AsyncIterator, List, Tuple
+
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger("property-api.ndjson")
+
+MAX_LINE_BYTES = 64 * 1024
+
+try:
+    import orjson
+
+    def loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def dumps_line(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY)
+
+except ImportError:
+    logger.info("orjson not installed, falling back to the standard json module")
+
+    def loads(data: bytes) -> Any:
+        return json.loads(data)
+
+    def dumps_line(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode() + b"\n"
+
+
+class LineTooLongError(ValueError):
+    def __init__(self, line_number: int, max_line_bytes: int):
+        super().__init__(f"NDJSON record exceeds {max_line_bytes} bytes")
+        self.line_number = line_number
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # The body iterator reads the request stream itself, so the parent's
+        # concurrent disconnect listener would steal request chunks from it.
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_lines(stream: AsyncIterator[bytes],
+                     max_line_bytes: int = MAX_LINE_BYTES) -> AsyncIterator[List[Tuple[int, bytes]]]:
+    """Yield the complete lines of each received body chunk as ``(line_number, line)``.
+
+    Line numbers are 0-based and count blank lines, which are skipped.
+    """
+    buffer = b""
+    line_number = 0
+    async for chunk in stream:
+        buffer += chunk
+        lines = buffer.split(b"\n")
+        buffer = lines.pop()
+        numbered = []
+        for line in lines:
+            line = line.strip()
+            if line:
+                numbered.append((line_number, line))
+            line_number += 1
+        if numbered:
+            yield numbered
+        if len(buffer) > max_line_bytes:
+            raise LineTooLongError(line_number, max_line_bytes)
+
+    buffer = buffer.strip()
+    if buffer:
+        yield [(line_number, buffer)]
+
+
+async def iter_record_chunks(stream: AsyncIterator[bytes],
+                             chunk_size: int) -> AsyncIterator[List[Tuple[int, Any]]]:
+    """Parse an NDJSON byte stream into chunks of ``(line_number, record)``.
+
+    Chunks hold at most ``chunk_size`` records and are flushed after every
+    received body chunk, so slow uploads get results as their lines arrive.
+    Lines that are not valid JSON objects are yielded with a ``None`` record so
+    the caller can report them in order without aborting the stream.
+    """
+    async for lines in iter_lines(stream):
+        chunk: List[Tuple[int, Any]] = []
+        for line_number, line in lines:
+            try:
+                record = loads(line)
+            except ValueError:
+                record = None
+            chunk.append((line_number, record if isinstance(record, dict) else None))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
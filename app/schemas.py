@@ -1,28 +1,31 @@
 from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
-from typing import Literal
+from typing import Any, Dict, List, Literal, Optional
+
+from process.validation import (VALID_TYPES, VALID_SECTORS, CHILE_LATITUDE_RANGE,
+                                CHILE_LONGITUDE_RANGE, range_rule)
 
 
 class PropertyFeatures(BaseModel):
-    type: Literal["casa", "departamento"] = Field(..., example="casa")
-    sector: Literal["la reina", "las condes", "lo barnechea", "nunoa", "providencia", "vitacura"] = Field(..., example="las condes")
-    net_usable_area: float = Field(..., example=140.0, gt=0.0, le=10000.0)
-    net_area: float = Field(..., example=170.0, gt=0.0, le=10000.0)
-    n_rooms: float = Field(..., example=3.0, ge=0.0, le=20.0)
-    n_bathroom: float = Field(..., example=2.0, ge=0.0, le=20.0)
+    type: Literal[VALID_TYPES] = Field(..., example="casa")
+    sector: Literal[VALID_SECTORS] = Field(..., example="las condes")
+    net_usable_area: float = Field(..., example=140.0, **range_rule("net_usable_area").field_bounds())
+    net_area: float = Field(..., example=170.0, **range_rule("net_area").field_bounds())
+    n_rooms: float = Field(..., example=3.0, **range_rule("n_rooms").field_bounds())
+    n_bathroom: float = Field(..., example=2.0, **range_rule("n_bathroom").field_bounds())
     latitude: float = Field(..., example=-33.40123, ge=-90.0, le=90.0)
     longitude: float = Field(..., example=-70.58056, ge=-180.0, le=180.0)
     
     @field_validator('latitude')
     @classmethod
     def validate_latitude_chile_range(cls, v: float) -> float:
-        if not (-56.0 <= v <= -17.0):
+        if not (CHILE_LATITUDE_RANGE[0] <= v <= CHILE_LATITUDE_RANGE[1]):
             raise ValueError('latitude must be within Chilean territory range')
         return v
     
     @field_validator('longitude')
     @classmethod
     def validate_longitude_chile_range(cls, v: float) -> float:
-        if not (-81.0 <= v <= -66.0):
+        if not (CHILE_LONGITUDE_RANGE[0] <= v <= CHILE_LONGITUDE_RANGE[1]):
             raise ValueError('longitude must be within Chilean territory range')
         return v
     
@@ -64,6 +67,44 @@ class PredictionResponse(BaseModel):
     )
 
 
+class BatchPredictionRequest(BaseModel):
+    # Records are checked by the vectorized rule set rather than per-object
+    # PropertyFeatures validation, so invalid rows are reported instead of failing the batch
+    properties: List[Dict[str, Any]] = Field(..., min_length=1, max_length=10000)
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "properties": [
+                    {
+                        "type": "casa",
+                        "sector": "las condes",
+                        "net_usable_area": 140.0,
+                        "net_area": 170.0,
+                        "n_rooms": 3.0,
+                        "n_bathroom": 2.0,
+                        "latitude": -33.40123,
+                        "longitude": -70.58056
+                    }
+                ]
+            }
+        }
+    )
+
+
+class BatchPredictionItem(BaseModel):
+    index: int = Field(..., example=0)
+    predicted_price: Optional[float] = Field(default=None, example=125000000.0)
+    errors: List[str] = Field(default_factory=list, example=[])
+
+
+class BatchPredictionResponse(BaseModel):
+    predictions: List[BatchPredictionItem] = Field(...)
+    n_valid: int = Field(..., example=1)
+    n_invalid: int = Field(..., example=0)
+    model_version: str = Field(default="v1.0")
+
+
 class HealthResponse(BaseModel):
     status: str = Field(...)
     model_loaded: bool = Field(...)
@@ -78,3 +119,37 @@ class HealthResponse(BaseModel):
             }
         }
     )
+
+
+class AdmissionMetricsResponse(BaseModel):
+    admitted: int = Field(...)
+    shed: Dict[str, int] = Field(...)
+    rate_limited: Dict[str, int] = Field(...)
+    in_flight: int = Field(...)
+    max_in_flight: int = Field(...)
+    latency_ewma_ms: float = Field(...)
+    latency_threshold_ms: float = Field(...)
+    batches_in_flight: int = Field(...)
+    max_batches: int = Field(...)
+    batch_latency_ewma_ms: float = Field(...)
+    streams_in_flight: int = Field(...)
+    max_streams: int = Field(...)
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "admitted": 1520,
+                "shed": {"predict_queue_full": 12, "predict_latency": 3},
+                "rate_limited": {"client-a": 40},
+                "in_flight": 4,
+                "max_in_flight": 16,
+                "latency_ewma_ms": 35.2,
+                "latency_threshold_ms": 1000.0,
+                "batches_in_flight": 1,
+                "max_batches": 4,
+                "batch_latency_ewma_ms": 820.5,
+                "streams_in_flight": 1,
+                "max_streams": 4
+            }
+        }
+    )
@@ -0,0 +1,77 @@
+import time
+import argparse
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+PAYLOAD = {
+    "type": "casa",
+    "sector": "las condes",
+    "net_usable_area": 140.0,
+    "net_area": 170.0,
+    "n_rooms": 3.0,
+    "n_bathroom": 2.0,
+    "latitude": -33.40123,
+    "longitude": -70.58056
+}
+
+
+def run_client(url: str, api_key: str, deadline: float, honor_retry_after: bool,
+               results: dict, lock: threading.Lock) -> None:
+    session = requests.Session()
+    headers = {"X-API-Key": api_key}
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        retry_after = 0.0
+        try:
+            response = session.post(url, json=PAYLOAD, headers=headers, timeout=30)
+            status_code = response.status_code
+            retry_after = float(response.headers.get("Retry-After", 0))
+        except requests.RequestException:
+            status_code = "error"
+        latency_ms = (time.perf_counter() - start) * 1000.0
+        with lock:
+            results[status_code].append(latency_ms)
+        if honor_retry_after and retry_after > 0:
+            time.sleep(min(retry_after, max(0.0, deadline - time.perf_counter())))
+
+
+def summarize(latencies: list) -> str:
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return f"p50={p50:8.1f}ms  p95={p95:8.1f}ms  p99={p99:8.1f}ms  max={max(latencies):8.1f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Overload /predict and report tail latency per status code")
+    parser.add_argument("--url", default="http://localhost:8000/predict")
+    parser.add_argument("--api-keys", default="your-secret-key",
+                        help="Comma-separated keys; clients are spread across them")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--honor-retry-after", action="store_true",
+                        help="Back off for Retry-After seconds after a 429/503, like a well-behaved client")
+    args = parser.parse_args()
+
+    api_keys = [key.strip() for key in args.api_keys.split(",") if key.strip()]
+    results = defaultdict(list)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for i in range(args.concurrency):
+            pool.submit(run_client, args.url, api_keys[i % len(api_keys)], deadline,
+                        args.honor_retry_after, results, lock)
+
+    total = sum(len(latencies) for latencies in results.values())
+    print(f"requests: {total} in {args.duration:.0f}s with {args.concurrency} clients "
+          f"({total / args.duration:,.0f} req/s)")
+    for status_code in sorted(results, key=str):
+        latencies = results[status_code]
+        print(f"  {status_code!s:>5}: {len(latencies):7d}  {summarize(latencies)}")
+
+
+if __name__ == "__main__":
+    main()
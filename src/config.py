@@ -4,6 +4,7 @@ import os
 RANDOM_STATE: int = int(os.getenv("RANDOM_STATE", "42"))
 
 CATEGORICAL_COLS: List[str] = ["type", "sector"]
+GEO_COLS: List[str] = ["latitude", "longitude"]
 TARGET_COL: str = "price"
 ID_COLS: List[str] = ["id", "target"]
 
@@ -15,6 +16,15 @@ DEFAULT_MODEL_PARAMS: Dict[str, Any] = {
     "random_state": RANDOM_STATE
 }
 
+MODEL_PATH: str = "models/property_model.joblib"
+COMPACT_MODEL_PATH: str = "models/property_model_compact.joblib"
+COMPACTION_REPORT_PATH: str = "models/compaction_report.json"
+COMPACTION_MAE_TOLERANCE: float = float(os.getenv("COMPACTION_MAE_TOLERANCE", "0.01"))
+COMPACTION_QUANTIZE: bool = os.getenv("COMPACTION_QUANTIZE", "true").lower() == "true"
+
+GEO_CELL_SIZE_DEG: float = float(os.getenv("GEO_CELL_SIZE_DEG", "0.01"))
+FEATURE_CACHE_DIR: str = os.getenv("FEATURE_CACHE_DIR", "models/.cache")
+
 DATA_SOURCE_TYPE: str = os.getenv("DATA_SOURCE_TYPE", "csv")
 
 DEFAULT_TRAIN_PATH: str = "data/train.csv"
@@ -1,5 +1,6 @@
 import sys
 import os
+import json
 import joblib
 import logging
 import numpy as np
@@ -11,11 +12,13 @@ from config import RANDOM_STATE
 from process.data_sources import create_data_source
 from process.preprocessor import get_feature_columns, create_preprocessor
 from train.trainer import create_model_pipeline, train_model
+from train.compaction import compact_pipeline
 from predict.predictor import make_predictions
 from predict.evaluator import print_metrics
-from config import (CATEGORICAL_COLS, TARGET_COL, DATA_SOURCE_TYPE, 
-                   DEFAULT_TRAIN_PATH, DEFAULT_TEST_PATH, DATABASE_URL, 
-                   TRAIN_QUERY, TEST_QUERY)
+from config import (CATEGORICAL_COLS, GEO_COLS, GEO_CELL_SIZE_DEG, FEATURE_CACHE_DIR,
+                   TARGET_COL, DATA_SOURCE_TYPE, DEFAULT_TRAIN_PATH, DEFAULT_TEST_PATH, DATABASE_URL, 
+                   TRAIN_QUERY, TEST_QUERY, MODEL_PATH, COMPACT_MODEL_PATH,
+                   COMPACTION_REPORT_PATH, COMPACTION_MAE_TOLERANCE, COMPACTION_QUANTIZE)
 
 logger = logging.getLogger("property-api.training")
 
@@ -58,7 +61,9 @@ def main():
             raise ValueError(f"Target column '{TARGET_COL}' not found in datasets")
         
         logger.info("Creating preprocessor...")
-        preprocessor = create_preprocessor(CATEGORICAL_COLS)
+        preprocessor = create_preprocessor(CATEGORICAL_COLS, GEO_COLS,
+                                           geo_cell_size=GEO_CELL_SIZE_DEG,
+                                           cache_dir=FEATURE_CACHE_DIR)
         
         logger.info("Creating model pipeline...")
         pipeline = create_model_pipeline(preprocessor)
@@ -74,7 +79,7 @@ def main():
         print_metrics(test_predictions, test_target)
         
         logger.info("Saving model...")
-        model_path = Path("models/property_model.joblib")
+        model_path = Path(MODEL_PATH)
         model_path.parent.mkdir(parents=True, exist_ok=True)
         
         model_data = {
@@ -85,6 +90,21 @@ def main():
         joblib.dump(model_data, model_path)
         logger.info("Model saved successfully")
         
+        logger.info("Compacting model (MAE tolerance: %.2f%%)...", COMPACTION_MAE_TOLERANCE * 100)
+        compacted_pipeline, compaction_report = compact_pipeline(
+            trained_pipeline, test[train_cols], test_target,
+            mae_tolerance=COMPACTION_MAE_TOLERANCE,
+            quantize=COMPACTION_QUANTIZE
+        )
+        
+        joblib.dump({
+            'model': compacted_pipeline,
+            'feature_columns': train_cols
+        }, COMPACT_MODEL_PATH)
+        with open(COMPACTION_REPORT_PATH, 'w') as f:
+            json.dump(compaction_report, f, indent=2)
+        logger.info("Compacted model saved to %s", COMPACT_MODEL_PATH)
+        
     except FileNotFoundError as e:
         logger.error("Required file not found: %s", str(e))
         sys.exit(1)
@@ -4,6 +4,8 @@ from abc import ABC, abstractmethod
 from typing import Tuple
 from pathlib import Path
 
+from process.validation import filter_valid_rows
+
 logger = logging.getLogger("property-api.data_sources")
 
 
@@ -40,6 +42,9 @@ class CSVDataSource(DataSource):
         if 'id' in test.columns:
             test = test.sort_values('id').reset_index(drop=True)
         
+        train = filter_valid_rows(train, "train")
+        test = filter_valid_rows(test, "test")
+        
         logger.info("CSV data loaded - Train: %d rows, Test: %d rows", len(train), len(test))
         return train, test
 
@@ -67,6 +72,9 @@ class SQLDataSource(DataSource):
         if train.empty or test.empty:
             raise ValueError("One or more datasets are empty")
         
+        train = filter_valid_rows(train, "train")
+        test = filter_valid_rows(test, "test")
+        
         logger.info("SQL data loaded - Train: %d rows, Test: %d rows", len(train), len(test))
         return train, test
 
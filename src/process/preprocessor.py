@@ -1,13 +1,220 @@
 from category_encoders import TargetEncoder
+from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.compose import ColumnTransformer
+from sklearn.model_selection import KFold
+import hashlib
+import joblib
 import logging
 import os
-from typing import List
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger("property-api.preprocessor")
 
 RANDOM_STATE = int(os.getenv("RANDOM_STATE", "42"))
 
+EARTH_RADIUS_KM = 6371.0088
+
+# (latitude, longitude) of reference locations in Santiago
+GEO_KEY_POINTS: Dict[str, Tuple[float, float]] = {
+    "plaza_de_armas": (-33.4378, -70.6504),
+    "costanera_center": (-33.4173, -70.6064),
+    "parque_arauco": (-33.4020, -70.5786),
+}
+
+
+def haversine_km(lat: np.ndarray, lon: np.ndarray, point_lat: float, point_lon: float) -> np.ndarray:
+    lat_rad, lon_rad = np.radians(lat), np.radians(lon)
+    point_lat_rad, point_lon_rad = np.radians(point_lat), np.radians(point_lon)
+    a = (np.sin((lat_rad - point_lat_rad) / 2.0) ** 2
+         + np.cos(lat_rad) * np.cos(point_lat_rad) * np.sin((lon_rad - point_lon_rad) / 2.0) ** 2)
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class GeoFeatureTransformer(BaseEstimator, TransformerMixin):
+    """Derive location features from ``latitude``/``longitude`` columns.
+
+    Outputs the haversine distance to each key point, the grid cell ID and two
+    training-set aggregates per cell: the smoothed mean target and the listing
+    count. Aggregates are stored as compact float32 grids, so ``transform`` only
+    indexes into them. When ``cache_dir`` is set, ``fit_transform`` results are
+    cached on disk by dataset fingerprint, keeping the ``cache_max_entries``
+    most recently used entries.
+
+    Like sklearn's ``TargetEncoder``, ``fit_transform`` returns out-of-fold cell
+    means for the training rows so no row sees its own target; the full-data
+    grid is only used by ``transform``.
+    """
+
+    def __init__(self, cell_size: float = 0.01, smoothing: float = 10.0,
+                 key_points: Optional[Dict[str, Tuple[float, float]]] = None,
+                 cache_dir: Optional[str] = None, cache_max_entries: int = 4, cv: int = 5,
+                 random_state: Optional[int] = RANDOM_STATE):
+        self.cell_size = cell_size
+        self.smoothing = smoothing
+        self.key_points = key_points
+        self.cache_dir = cache_dir
+        self.cache_max_entries = cache_max_entries
+        self.cv = cv
+        self.random_state = random_state
+
+    def _coordinates(self, X) -> Tuple[np.ndarray, np.ndarray]:
+        values = np.asarray(X, dtype=np.float64)
+        if values.ndim != 2 or values.shape[1] != 2:
+            raise ValueError("GeoFeatureTransformer expects exactly two columns: latitude, longitude")
+        return values[:, 0], values[:, 1]
+
+    def _points(self) -> Dict[str, Tuple[float, float]]:
+        return GEO_KEY_POINTS if self.key_points is None else self.key_points
+
+    def _fingerprint(self, lat: np.ndarray, lon: np.ndarray, y: np.ndarray) -> str:
+        digest = hashlib.sha256()
+        for values in (lat, lon, y):
+            digest.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+        digest.update(repr((self.cell_size, self.smoothing, self.cv, self.random_state,
+                            sorted(self._points().items()))).encode())
+        return digest.hexdigest()[:16]
+
+    def _prune_cache(self, cache_dir: Path) -> None:
+        entries = sorted(cache_dir.glob("geo_*.joblib"), key=lambda path: path.stat().st_mtime, reverse=True)
+        for path in entries[max(self.cache_max_entries, 1):]:
+            logger.info("Removing stale geo feature cache entry: %s", path.name)
+            path.unlink(missing_ok=True)
+
+    def _set_grid(self, grid: Dict[str, object]) -> None:
+        self.origin_ = grid["origin"]
+        self.grid_shape_ = grid["grid_shape"]
+        self.global_mean_ = grid["global_mean"]
+        self.cell_mean_ = grid["cell_mean"]
+        self.cell_count_ = grid["cell_count"]
+
+    def _cell_index(self, lat: np.ndarray, lon: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        rows = np.floor((lat - self.origin_[0]) / self.cell_size).astype(np.int64)
+        cols = np.floor((lon - self.origin_[1]) / self.cell_size).astype(np.int64)
+        inside = (rows >= 0) & (rows < self.grid_shape_[0]) & (cols >= 0) & (cols < self.grid_shape_[1])
+        return rows, cols, inside
+
+    def _cell_aggregates(self, flat: np.ndarray, y: np.ndarray,
+                         global_mean: float) -> Tuple[np.ndarray, np.ndarray]:
+        n_cells = self.grid_shape_[0] * self.grid_shape_[1]
+        counts = np.bincount(flat, minlength=n_cells).astype(np.float64)
+        sums = np.bincount(flat, weights=y, minlength=n_cells)
+        smoothed = (sums + self.smoothing * global_mean) / (counts + self.smoothing)
+        return smoothed, counts
+
+    def _build_grid(self, lat: np.ndarray, lon: np.ndarray, y: np.ndarray) -> Dict[str, object]:
+        # Size the grid on the bulk of the data so a few outlying listings
+        # don't blow up the lookup table; they fall back to global aggregates.
+        lat_low, lat_high = np.quantile(lat, [0.005, 0.995])
+        lon_low, lon_high = np.quantile(lon, [0.005, 0.995])
+        self.origin_ = (float(lat_low), float(lon_low))
+        self.grid_shape_ = (int((lat_high - lat_low) // self.cell_size) + 1,
+                            int((lon_high - lon_low) // self.cell_size) + 1)
+
+        rows, cols, inside = self._cell_index(lat, lon)
+        flat = (rows * self.grid_shape_[1] + cols)[inside]
+        global_mean = float(y.mean())
+        smoothed, counts = self._cell_aggregates(flat, y[inside], global_mean)
+
+        return {
+            "origin": self.origin_,
+            "grid_shape": self.grid_shape_,
+            "global_mean": global_mean,
+            "cell_mean": smoothed.astype(np.float32).reshape(self.grid_shape_),
+            "cell_count": counts.astype(np.float32).reshape(self.grid_shape_),
+        }
+
+    def fit(self, X, y=None):
+        if y is None:
+            raise ValueError("GeoFeatureTransformer requires a target to compute cell aggregates")
+
+        lat, lon = self._coordinates(X)
+        y = np.asarray(y, dtype=np.float64)
+        if len(lat) == 0:
+            raise ValueError("Cannot fit GeoFeatureTransformer on empty data")
+
+        self._set_grid(self._build_grid(lat, lon, y))
+        logger.info("Geo feature grid fitted: %dx%d cells", *self.grid_shape_)
+        return self
+
+    def transform(self, X) -> np.ndarray:
+        lat, lon = self._coordinates(X)
+        rows, cols, inside = self._cell_index(lat, lon)
+        rows = np.clip(rows, 0, self.grid_shape_[0] - 1)
+        cols = np.clip(cols, 0, self.grid_shape_[1] - 1)
+
+        points = self._points()
+        features = np.empty((len(lat), len(points) + 3), dtype=np.float64)
+        for i, (point_lat, point_lon) in enumerate(points.values()):
+            features[:, i] = haversine_km(lat, lon, point_lat, point_lon)
+
+        # Cells outside the training extent fall back to the global aggregates
+        features[:, -3] = np.where(inside, rows * self.grid_shape_[1] + cols, -1)
+        features[:, -2] = np.where(inside, self.cell_mean_[rows, cols], self.global_mean_)
+        features[:, -1] = np.where(inside, self.cell_count_[rows, cols], 0.0)
+        return features
+
+    def fit_transform(self, X, y=None, **fit_params) -> np.ndarray:
+        # Building the grid alone is a single bincount, so only the full
+        # training output (grid, distances and out-of-fold means) is cached.
+        cache_path = None
+        if self.cache_dir and y is not None:
+            lat, lon = self._coordinates(X)
+            fingerprint = self._fingerprint(lat, lon, np.asarray(y, dtype=np.float64))
+            cache_path = Path(self.cache_dir) / f"geo_features_{fingerprint}.joblib"
+            if cache_path.exists():
+                logger.info("Loading cached geo features: %s", cache_path.name)
+                cached = joblib.load(cache_path)
+                cache_path.touch()
+                self._set_grid(cached["grid"])
+                return cached["features"]
+
+        self.fit(X, y)
+        features = self._out_of_fold_features(X, y)
+
+        if cache_path is not None:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            grid = {
+                "origin": self.origin_,
+                "grid_shape": self.grid_shape_,
+                "global_mean": self.global_mean_,
+                "cell_mean": self.cell_mean_,
+                "cell_count": self.cell_count_,
+            }
+            joblib.dump({"grid": grid, "features": features}, cache_path)
+            self._prune_cache(cache_path.parent)
+        return features
+
+    def _out_of_fold_features(self, X, y) -> np.ndarray:
+        features = self.transform(X)
+
+        lat, lon = self._coordinates(X)
+        y = np.asarray(y, dtype=np.float64)
+        rows, cols, inside = self._cell_index(lat, lon)
+        flat = rows * self.grid_shape_[1] + cols
+
+        # Replace the in-sample cell means, which include each row's own target,
+        # with means computed from the other folds.
+        out_of_fold = np.empty(len(y), dtype=np.float64)
+        folds = KFold(n_splits=self.cv, shuffle=True, random_state=self.random_state)
+        for train_idx, held_out_idx in folds.split(flat):
+            train_inside = train_idx[inside[train_idx]]
+            fold_mean = float(y[train_idx].mean())
+            smoothed, _ = self._cell_aggregates(flat[train_inside], y[train_inside], fold_mean)
+            out_of_fold[held_out_idx] = np.where(
+                inside[held_out_idx],
+                smoothed[np.where(inside[held_out_idx], flat[held_out_idx], 0)].astype(np.float32),
+                fold_mean
+            )
+
+        features[:, -2] = out_of_fold
+        return features
+
+    def get_feature_names_out(self, input_features=None) -> np.ndarray:
+        names = [f"distance_km_{name}" for name in self._points()]
+        return np.asarray(names + ["geo_cell_id", "geo_cell_mean_target", "geo_cell_count"], dtype=object)
+
 
 def get_feature_columns(df_columns: List[str]) -> List[str]:
     try:
@@ -25,21 +232,23 @@ def get_feature_columns(df_columns: List[str]) -> List[str]:
         raise ValueError(f"Failed to process feature columns: {str(e)}")
 
 
-def create_preprocessor(categorical_cols: List[str]) -> ColumnTransformer:
+def create_preprocessor(categorical_cols: List[str], geo_cols: Optional[List[str]] = None,
+                        geo_cell_size: float = 0.01, cache_dir: Optional[str] = None) -> ColumnTransformer:
     try:
         if not categorical_cols:
             raise ValueError("No categorical columns provided")
         
         categorical_transformer = TargetEncoder()
+        transformers = [('categorical', categorical_transformer, categorical_cols)]
+        
+        if geo_cols:
+            geo_transformer = GeoFeatureTransformer(cell_size=geo_cell_size, cache_dir=cache_dir)
+            transformers.append(('geo', geo_transformer, geo_cols))
         
-        preprocessor = ColumnTransformer(
-            transformers=[
-                ('categorical', categorical_transformer, categorical_cols)
-            ]
-        )
+        preprocessor = ColumnTransformer(transformers=transformers)
         
-        logger.info("Preprocessor created for %d categorical columns (using global random state)", 
-                   len(categorical_cols))
+        logger.info("Preprocessor created for %d categorical and %d geo columns (using global random state)", 
+                   len(categorical_cols), len(geo_cols or []))
         return preprocessor
         
     except Exception as e:
@@ -0,0 +1,181 @@
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("property-api.validation")
+
+VALID_TYPES: Tuple[str, ...] = ("casa", "departamento")
+VALID_SECTORS: Tuple[str, ...] = (
+    "la reina", "las condes", "lo barnechea", "nunoa", "providencia", "vitacura"
+)
+
+CHILE_LATITUDE_RANGE: Tuple[float, float] = (-56.0, -17.0)
+CHILE_LONGITUDE_RANGE: Tuple[float, float] = (-81.0, -66.0)
+
+
+@dataclass(frozen=True)
+class AllowedValuesRule:
+    column: str
+    allowed: Tuple[str, ...]
+    code: str
+
+    def violations(self, df: pd.DataFrame) -> np.ndarray:
+        return ~df[self.column].isin(self.allowed).to_numpy()
+
+
+@dataclass(frozen=True)
+class RangeRule:
+    column: str
+    low: float
+    high: float
+    code: str
+    low_inclusive: bool = True
+    high_inclusive: bool = True
+
+    def violations(self, df: pd.DataFrame) -> np.ndarray:
+        values = _as_float(df[self.column])
+        above_low = values >= self.low if self.low_inclusive else values > self.low
+        below_high = values <= self.high if self.high_inclusive else values < self.high
+        # Non-numeric input coerces to NaN and fails both comparisons; truly
+        # missing values are masked out and reported as missing_<column> instead
+        return ~(above_low & below_high)
+
+    def field_bounds(self) -> Dict[str, float]:
+        return {
+            "ge" if self.low_inclusive else "gt": self.low,
+            "le" if self.high_inclusive else "lt": self.high,
+        }
+
+
+@dataclass(frozen=True)
+class NotGreaterThanRule:
+    column: str
+    other: str
+    code: str
+
+    def violations(self, df: pd.DataFrame) -> np.ndarray:
+        return _as_float(df[self.column]) > _as_float(df[self.other])
+
+
+Rule = Union[AllowedValuesRule, RangeRule, NotGreaterThanRule]
+
+PROPERTY_RULES: Tuple[Rule, ...] = (
+    AllowedValuesRule("type", VALID_TYPES, "invalid_type"),
+    AllowedValuesRule("sector", VALID_SECTORS, "invalid_sector"),
+    RangeRule("net_usable_area", 0.0, 10000.0, "net_usable_area_out_of_range", low_inclusive=False),
+    RangeRule("net_area", 0.0, 10000.0, "net_area_out_of_range", low_inclusive=False),
+    RangeRule("n_rooms", 0.0, 20.0, "n_rooms_out_of_range"),
+    RangeRule("n_bathroom", 0.0, 20.0, "n_bathroom_out_of_range"),
+    RangeRule("latitude", *CHILE_LATITUDE_RANGE, "latitude_outside_chile"),
+    RangeRule("longitude", *CHILE_LONGITUDE_RANGE, "longitude_outside_chile"),
+    NotGreaterThanRule("net_usable_area", "net_area", "net_usable_area_exceeds_net_area"),
+)
+
+
+def _rule_columns(rule: Rule) -> Tuple[str, ...]:
+    if isinstance(rule, NotGreaterThanRule):
+        return (rule.column, rule.other)
+    return (rule.column,)
+
+
+REQUIRED_COLUMNS: Tuple[str, ...] = tuple(dict.fromkeys(
+    col for rule in PROPERTY_RULES for col in _rule_columns(rule)
+))
+
+
+def _as_float(series: pd.Series) -> np.ndarray:
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+
+
+def range_rule(column: str) -> RangeRule:
+    for rule in PROPERTY_RULES:
+        if isinstance(rule, RangeRule) and rule.column == column:
+            return rule
+    raise KeyError(f"No range rule defined for column: {column}")
+
+
+class ValidationResult:
+    """Per-row outcome of ``validate_frame``.
+
+    ``error_bits`` holds one bit per rule in ``codes`` so the checks stay a
+    single integer array; codes are only decoded for rows that failed.
+    """
+
+    def __init__(self, error_bits: np.ndarray, codes: Sequence[str]):
+        self.error_bits = error_bits
+        self.codes = tuple(codes)
+
+    @property
+    def valid_mask(self) -> np.ndarray:
+        return self.error_bits == 0
+
+    @property
+    def n_invalid(self) -> int:
+        return int(np.count_nonzero(self.error_bits))
+
+    def row_errors(self, index: int) -> List[str]:
+        bits = int(self.error_bits[index])
+        return [code for i, code in enumerate(self.codes) if bits >> i & 1]
+
+    def error_codes(self) -> List[List[str]]:
+        errors: List[List[str]] = [[] for _ in range(len(self.error_bits))]
+        for i in np.flatnonzero(self.error_bits):
+            errors[i] = self.row_errors(i)
+        return errors
+
+    def error_counts(self) -> Dict[str, int]:
+        counts = {}
+        for i, code in enumerate(self.codes):
+            n = int(np.count_nonzero(self.error_bits >> i & 1))
+            if n:
+                counts[code] = n
+        return counts
+
+
+def validate_frame(df: pd.DataFrame, rules: Sequence[Rule] = PROPERTY_RULES) -> ValidationResult:
+    required = tuple(dict.fromkeys(col for rule in rules for col in _rule_columns(rule)))
+    codes = [rule.code for rule in rules] + [f"missing_{col}" for col in required]
+    if len(codes) > 63:
+        raise ValueError("Too many validation rules for a 64-bit error mask")
+
+    n_rows = len(df)
+    missing = {
+        col: df[col].isna().to_numpy() if col in df.columns else np.ones(n_rows, dtype=bool)
+        for col in required
+    }
+    failed = {col: mask.copy() for col, mask in missing.items()}
+
+    error_bits = np.zeros(n_rows, dtype=np.int64)
+    # Single-column rules run first; cross-column rules only see rows whose
+    # columns all passed, like pydantic skipping model validators after a field error.
+    for cross_column in (False, True):
+        for bit, rule in enumerate(rules):
+            if isinstance(rule, NotGreaterThanRule) != cross_column:
+                continue
+            columns = _rule_columns(rule)
+            if any(col not in df.columns for col in columns):
+                continue
+            violations = rule.violations(df)
+            for col in columns:
+                violations &= ~failed[col]
+            if not cross_column:
+                failed[rule.column] |= violations
+            error_bits |= violations.astype(np.int64) << bit
+
+    for offset, col in enumerate(required):
+        error_bits |= missing[col].astype(np.int64) << (len(rules) + offset)
+
+    return ValidationResult(error_bits, codes)
+
+
+def filter_valid_rows(df: pd.DataFrame, dataset_name: str = "dataset") -> pd.DataFrame:
+    result = validate_frame(df)
+    if result.n_invalid == 0:
+        return df
+
+    logger.warning("Dropping %d of %d %s rows failing validation: %s",
+                   result.n_invalid, len(df), dataset_name, result.error_counts())
+    return df[result.valid_mask].reset_index(drop=True)
@@ -0,0 +1,241 @@
+from sklearn.pipeline import Pipeline
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.metrics import mean_absolute_error
+from sklearn.tree._tree import Tree, TREE_LEAF, TREE_UNDEFINED
+import numpy as np
+import pandas as pd
+import copy
+import logging
+import time
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger("property-api.compaction")
+
+
+def staged_mae(pipeline: Pipeline, X: pd.DataFrame, y: np.ndarray) -> np.ndarray:
+    model = pipeline.named_steps['model']
+    X_transformed = pipeline[:-1].transform(X)
+    return np.array([mean_absolute_error(y, predictions)
+                     for predictions in model.staged_predict(X_transformed)])
+
+
+def mae_limit(stage_mae: np.ndarray, mae_tolerance: float) -> float:
+    if mae_tolerance < 0:
+        raise ValueError(f"MAE tolerance must be non-negative, got {mae_tolerance}")
+    return float(stage_mae[-1] * (1.0 + mae_tolerance))
+
+
+def select_n_estimators(stage_mae: np.ndarray, mae_tolerance: float) -> int:
+    """Smallest number of stages whose MAE is within ``mae_tolerance`` (relative) of the full ensemble."""
+    return int(np.argmax(stage_mae <= mae_limit(stage_mae, mae_tolerance))) + 1
+
+
+def truncate_ensemble(model: GradientBoostingRegressor, n_estimators: int) -> GradientBoostingRegressor:
+    truncated = copy.copy(model)
+    truncated.estimators_ = model.estimators_[:n_estimators]
+    truncated.train_score_ = model.train_score_[:n_estimators]
+    truncated.n_estimators = n_estimators
+    truncated.n_estimators_ = n_estimators
+    for attr in ('oob_improvement_', 'oob_scores_'):
+        if hasattr(model, attr):
+            setattr(truncated, attr, getattr(model, attr)[:n_estimators])
+    return truncated
+
+
+def _quantize_tree_state(nodes: np.ndarray, values: np.ndarray) -> np.ndarray:
+    internal = nodes['left_child'] != TREE_LEAF
+    thresholds = nodes['threshold'][internal]
+    thresholds_32 = thresholds.astype(np.float32)
+    # Trees compare float32 inputs against the threshold, so rounding it down to the
+    # nearest float32 keeps every split decision identical.
+    rounded_up = thresholds_32.astype(np.float64) > thresholds
+    thresholds_32[rounded_up] = np.nextafter(thresholds_32[rounded_up], np.float32(-np.inf))
+    nodes['threshold'][internal] = thresholds_32
+    return values.astype(np.float32).astype(np.float64)
+
+
+def _collapse_tree_state(nodes: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, int]:
+    left, right = nodes['left_child'], nodes['right_child']
+
+    # Children always have larger ids than their parent, so a reverse sweep
+    # merges sibling leaves bottom-up and lets whole redundant subtrees collapse.
+    for node in range(len(nodes) - 1, -1, -1):
+        left_child, right_child = left[node], right[node]
+        if left_child == TREE_LEAF:
+            continue
+        if (left[left_child] == TREE_LEAF and left[right_child] == TREE_LEAF
+                and np.array_equal(values[left_child], values[right_child])):
+            values[node] = values[left_child]
+            left[node] = right[node] = TREE_LEAF
+            nodes['feature'][node] = TREE_UNDEFINED
+            nodes['threshold'][node] = TREE_UNDEFINED
+
+    reachable = np.zeros(len(nodes), dtype=bool)
+    depth = np.zeros(len(nodes), dtype=np.int64)
+    stack = [0]
+    while stack:
+        node = stack.pop()
+        reachable[node] = True
+        if left[node] != TREE_LEAF:
+            depth[[left[node], right[node]]] = depth[node] + 1
+            stack.extend((left[node], right[node]))
+
+    keep = np.flatnonzero(reachable)
+    new_ids = np.full(len(nodes), TREE_LEAF, dtype=np.int64)
+    new_ids[keep] = np.arange(len(keep))
+
+    nodes = nodes[keep]
+    internal = nodes['left_child'] != TREE_LEAF
+    nodes['left_child'][internal] = new_ids[nodes['left_child'][internal]]
+    nodes['right_child'][internal] = new_ids[nodes['right_child'][internal]]
+    return nodes, values[keep], int(depth[keep].max())
+
+
+def compact_tree(tree: Tree, quantize: bool = False) -> Tree:
+    state = tree.__getstate__()
+    nodes = state['nodes'].copy()
+    values = state['values'].copy()
+
+    if quantize:
+        values = _quantize_tree_state(nodes, values)
+    nodes, values, max_depth = _collapse_tree_state(nodes, values)
+
+    compacted = Tree(tree.n_features, np.asarray(tree.n_classes, dtype=np.intp), tree.n_outputs)
+    compacted.__setstate__({
+        'max_depth': max_depth,
+        'node_count': len(nodes),
+        'nodes': nodes,
+        'values': values,
+    })
+    return compacted
+
+
+def compact_ensemble(model: GradientBoostingRegressor, quantize: bool = False) -> GradientBoostingRegressor:
+    compacted = copy.deepcopy(model)
+    for estimator in compacted.estimators_.ravel():
+        estimator.tree_ = compact_tree(estimator.tree_, quantize=quantize)
+    if quantize and hasattr(compacted.init_, 'constant_'):
+        compacted.init_.constant_ = compacted.init_.constant_.astype(np.float32).astype(np.float64)
+    return compacted
+
+
+def count_nodes(model: GradientBoostingRegressor) -> int:
+    return int(sum(estimator.tree_.node_count for estimator in model.estimators_.ravel()))
+
+
+def measure_latency(pipeline: Pipeline, X: pd.DataFrame, n_repeats: int = 50) -> Dict[str, float]:
+    single_row = X.iloc[[0]]
+    timings = []
+    for _ in range(n_repeats):
+        start = time.perf_counter()
+        pipeline.predict(single_row)
+        timings.append(time.perf_counter() - start)
+
+    model = pipeline.named_steps['model']
+    X_transformed = pipeline[:-1].transform(X)
+    start = time.perf_counter()
+    model.predict(X_transformed)
+    model_batch_s = time.perf_counter() - start
+
+    return {
+        'single_row_ms': float(np.median(timings) * 1000.0),
+        'model_batch_ms': model_batch_s * 1000.0,
+    }
+
+
+def _with_model(pipeline: Pipeline, model: GradientBoostingRegressor) -> Pipeline:
+    return Pipeline(pipeline.steps[:-1] + [('model', model)])
+
+
+def compact_pipeline(pipeline: Pipeline, X_test: pd.DataFrame, y_test: np.ndarray,
+                     mae_tolerance: float = 0.01, quantize: bool = True,
+                     curve_points: int = 10) -> Tuple[Pipeline, Dict[str, Any]]:
+    try:
+        if X_test.empty:
+            raise ValueError("Test data is empty")
+        if mae_tolerance < 0:
+            raise ValueError(f"MAE tolerance must be non-negative, got {mae_tolerance}")
+
+        model = pipeline.named_steps['model']
+        if not isinstance(model, GradientBoostingRegressor):
+            raise ValueError("Compaction requires a GradientBoostingRegressor model step")
+
+        logger.info("Evaluating staged predictions for %d estimators", len(model.estimators_))
+        stage_mae = staged_mae(pipeline, X_test, y_test)
+        n_total = len(stage_mae)
+        limit = mae_limit(stage_mae, mae_tolerance)
+        n_selected = select_n_estimators(stage_mae, mae_tolerance)
+
+        # Stages are chosen on unquantized MAE, so re-check the compacted model and
+        # step back to more stages while quantization pushes it past the tolerance.
+        X_transformed = pipeline[:-1].transform(X_test)
+        compacted_model = None
+        for n_estimators in range(n_selected, n_total + 1):
+            if stage_mae[n_estimators - 1] > limit:
+                continue
+            candidate = compact_ensemble(truncate_ensemble(model, n_estimators), quantize=quantize)
+            if mean_absolute_error(y_test, candidate.predict(X_transformed)) <= limit:
+                compacted_model = candidate
+                break
+
+        if compacted_model is None:
+            logger.warning("Quantized model exceeds the MAE tolerance at every stage count; "
+                           "keeping %d stages without quantization", n_selected)
+            quantize = False
+            compacted_model = compact_ensemble(truncate_ensemble(model, n_selected), quantize=False)
+        elif n_estimators != n_selected:
+            logger.warning("Quantization pushed MAE past the tolerance at %d stages; using %d stages",
+                           n_selected, n_estimators)
+            n_selected = n_estimators
+
+        n_nodes_truncated = count_nodes(truncate_ensemble(model, n_selected))
+        compacted = _with_model(pipeline, compacted_model)
+        compacted_mae = float(mean_absolute_error(y_test, compacted.predict(X_test)))
+
+        candidates = np.unique(np.linspace(1, n_total, num=curve_points).round().astype(int))
+        curve: List[Dict[str, float]] = []
+        for n_estimators in sorted(set(candidates.tolist()) | {n_selected}):
+            latency = measure_latency(_with_model(pipeline, truncate_ensemble(model, n_estimators)), X_test)
+            curve.append({'n_estimators': n_estimators, 'mae': float(stage_mae[n_estimators - 1]), **latency})
+
+        report = {
+            'mae_tolerance': mae_tolerance,
+            'quantized': quantize,
+            'baseline': {
+                'n_estimators': n_total,
+                'n_nodes': count_nodes(model),
+                'mae': float(stage_mae[-1]),
+                **measure_latency(pipeline, X_test),
+            },
+            'compacted': {
+                'n_estimators': n_selected,
+                'n_nodes': count_nodes(compacted_model),
+                # Truncation and leaf collapsing are reported separately so the
+                # node reduction is not all credited to pruning
+                'nodes_removed_by_truncation': count_nodes(model) - n_nodes_truncated,
+                'nodes_removed_by_pruning': n_nodes_truncated - count_nodes(compacted_model),
+                'mae': compacted_mae,
+                **measure_latency(compacted, X_test),
+            },
+            'curve': curve,
+        }
+
+        logger.info("Latency vs accuracy (n_estimators, MAE, single-row ms, model batch ms):")
+        for point in curve:
+            logger.info("  %4d  %14.4f  %8.3f  %10.3f", point['n_estimators'], point['mae'],
+                        point['single_row_ms'], point['model_batch_ms'])
+        logger.info("Compacted model: %d -> %d estimators, %d -> %d nodes "
+                    "(%d removed by truncation, %d by pruning), MAE %.4f -> %.4f",
+                    n_total, n_selected, report['baseline']['n_nodes'], report['compacted']['n_nodes'],
+                    report['compacted']['nodes_removed_by_truncation'],
+                    report['compacted']['nodes_removed_by_pruning'],
+                    report['baseline']['mae'], compacted_mae)
+
+        return compacted, report
+
+    except ValueError as e:
+        logger.error("Compaction validation error: %s", str(e))
+        raise
+    except Exception as e:
+        logger.error("Unexpected compaction error: %s", str(e))
+        raise RuntimeError(f"Model compaction failed: {str(e)}")